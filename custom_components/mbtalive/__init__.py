@@ -9,18 +9,29 @@ handling exceptions, and forwarding setup to the sensor platform.
 
 Functions:
 - async_setup: Sets up the MBTA integration.
-- async_setup_entry: Configures a new MBTA entry in Home Assistant.
+- async_setup_entry: Creates the trips coordinator of a MBTA entry and sets up its sensors.
 - async_unload_entry: Unloads a MBTA config entry.
 
+MBTA clients (and their cache) are shared by the config entries using the same
+API key, and dropped when the last of them is unloaded. Config entries watching
+the same trip share the trips fetched from the MBTA API.
+
 Logging:
 - Uses logging to provide feedback and error messages for integration setup and unload events.
 """
 
+import asyncio
+import functools
 import logging
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
-from homeassistant.helpers.aiohttp_client import async_get_clientsession
-from .const import DOMAIN
+from homeassistant.exceptions import ConfigEntryNotReady
+from mbtaclient.handlers.trips_handler import TripsHandler
+from mbtaclient.client.mbta_client import MBTAClient
+from mbtaclient.client.mbta_cache_manager import MBTACacheManager
+from mbtaclient.stop import StopType
+from .const import DATA_CLIENTS, DATA_PENDING_HANDLERS, DATA_TRIPS_SOURCES, DOMAIN
+from .coordinator import MBTATripCoordinator, TripsSource
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -36,22 +47,119 @@ async def async_setup(hass: HomeAssistant, config: dict) -> bool:
         _LOGGER.error("Error during async_setup: %s", e)
         return False
 
+def _acquire_client(hass: HomeAssistant, api_key: str) -> MBTAClient:
+    """Return the MBTA client shared by the config entries using this API key."""
+    clients = hass.data.setdefault(DOMAIN, {}).setdefault(DATA_CLIENTS, {})
+    client_entry = clients.get(api_key)
+    if client_entry is None:
+        _LOGGER.debug("Initializing MBTAClient (api_key set: %s)", bool(api_key))
+        client_entry = clients[api_key] = {
+            "client": MBTAClient(api_key=api_key, cache_manager=MBTACacheManager()),
+            "refcount": 0,
+        }
+    client_entry["refcount"] += 1
+    return client_entry["client"]
+
+def _release_client(hass: HomeAssistant, api_key: str) -> None:
+    """Release a shared MBTA client, dropping it when no config entry uses it anymore.
+
+    The HTTP session is managed by MBTAclient itself and shared by all clients,
+    so it is left open.
+    """
+    clients = hass.data[DOMAIN][DATA_CLIENTS]
+    client_entry = clients[api_key]
+    client_entry["refcount"] -= 1
+    if client_entry["refcount"] == 0:
+        del clients[api_key]
+        _LOGGER.debug("Dropping MBTAClient, no config entry uses it anymore")
+
+async def _create_trips_handler(
+    hass: HomeAssistant,
+    mbta_client: MBTAClient,
+    api_key: str,
+    depart_from: str,
+    arrive_at: str,
+) -> TripsHandler:
+    """Create a trips handler, sharing the creation in flight for the same trip.
+
+    Config entries set up concurrently for the same trip resolve the stops
+    through a single set of MBTA API requests.
+    """
+    pending = hass.data.setdefault(DOMAIN, {}).setdefault(DATA_PENDING_HANDLERS, {})
+    key = (api_key, depart_from, arrive_at)
+    task = pending.get(key)
+    if task is None:
+        task = pending[key] = hass.async_create_task(
+            TripsHandler.create(departure_stop_name=depart_from, mbta_client=mbta_client,arrival_stop_name=arrive_at, sort_by=StopType.ARRIVAL, max_trips=2)
+        )
+        task.add_done_callback(lambda _: pending.pop(key, None))
+    else:
+        _LOGGER.debug("Waiting for the TripsHandler already being created for this trip")
+    # Shielded so that a cancelled setup does not cancel the other waiters
+    return await asyncio.shield(task)
+
+async def _acquire_trips_source(
+    hass: HomeAssistant,
+    mbta_client: MBTAClient,
+    api_key: str,
+    depart_from: str,
+    arrive_at: str,
+) -> TripsSource:
+    """Return the trips source shared by the config entries watching this trip."""
+    sources = hass.data.setdefault(DOMAIN, {}).setdefault(DATA_TRIPS_SOURCES, {})
+    key = (api_key, depart_from, arrive_at)
+    if key not in sources:
+        trips_handler = await _create_trips_handler(hass, mbta_client, api_key, depart_from, arrive_at)
+        # Another entry may have registered the source while the handler was created
+        if key not in sources:
+            sources[key] = {"source": TripsSource(trips_handler), "refcount": 0}
+    source_entry = sources[key]
+    source_entry["refcount"] += 1
+    return source_entry["source"]
+
+def _release_trips_source(hass: HomeAssistant, api_key: str, depart_from: str, arrive_at: str) -> None:
+    """Release a shared trips source, dropping it when no config entry uses it anymore."""
+    sources = hass.data[DOMAIN][DATA_TRIPS_SOURCES]
+    key = (api_key, depart_from, arrive_at)
+    sources[key]["refcount"] -= 1
+    if sources[key]["refcount"] == 0:
+        del sources[key]
+
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
-    """Set up a config entry for MBTA."""
+    """Set up a config entry for MBTA.
+
+    Raises ConfigEntryNotReady if the MBTA API cannot be reached, so that Home
+    Assistant retries the setup with backoff.
+    """
     _LOGGER.debug("Setting up entry: %s", entry.entry_id)
 
+    # Extract configuration data
+    depart_from = entry.data.get("depart_from")
+    arrive_at = entry.data.get("arrive_at")
+    api_key = entry.data.get("api_key")
+
+    mbta_client = _acquire_client(hass, api_key)
+    # Also run when the setup fails
+    entry.async_on_unload(functools.partial(_release_client, hass, api_key))
+
     try:
-        # Example: If using a handler, initialize and store it (commented as placeholder)
-        # handler = SomeHandler(entry.data, session=async_get_clientsession(hass))
-        # await handler.initialize()
-        # hass.data[DOMAIN][entry.entry_id] = handler
+        _LOGGER.debug("Creating TripsHandler for departure from %s to %s", depart_from, arrive_at)
 
-        _LOGGER.debug("Forwarding setup to sensor platform for entry %s", entry.entry_id)
-        await hass.config_entries.async_forward_entry_setups(entry, ["sensor"])
-        return True
+        trips_source = await _acquire_trips_source(hass, mbta_client, api_key, depart_from, arrive_at)
     except Exception as e:
-        _LOGGER.error("Error setting up entry %s: %s", entry.entry_id, e)
-        return False
+        raise ConfigEntryNotReady(f"Error creating the MBTA trips handler: {e}") from e
+    entry.async_on_unload(functools.partial(_release_trips_source, hass, api_key, depart_from, arrive_at))
+
+    # Create and refresh the coordinator, raises ConfigEntryNotReady on failure
+    coordinator = MBTATripCoordinator(hass, trips_source)
+    _LOGGER.debug("Refreshing coordinator")
+    await coordinator.async_config_entry_first_refresh()
+    entry.async_on_unload(coordinator.async_shutdown)
+    hass.data.setdefault(DOMAIN, {})[entry.entry_id] = coordinator
+
+    _LOGGER.debug("Forwarding setup to sensor platform for entry %s", entry.entry_id)
+    await hass.config_entries.async_forward_entry_setups(entry, ["sensor"])
+    return True
 
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
@@ -60,6 +168,7 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     try:
         unload_ok = await hass.config_entries.async_unload_platforms(entry, ["sensor"])
         if unload_ok:
+            hass.data[DOMAIN].pop(entry.entry_id, None)
             _LOGGER.debug("Successfully unloaded platforms for entry %s", entry.entry_id)
             return True
         else:
@@ -1,2 +1,9 @@
 DOMAIN = "mbtalive"
-DEFAULT_NAME = "mbtalive"
\ No newline at end of file
+DEFAULT_NAME = "mbtalive"
+
+# hass.data[DOMAIN] key of the MBTA clients shared by the config entries
+DATA_CLIENTS = "clients"
+# hass.data[DOMAIN] key of the trips handlers being created
+DATA_PENDING_HANDLERS = "pending_trips_handlers"
+# hass.data[DOMAIN] key of the trips sources shared by identical config entries
+DATA_TRIPS_SOURCES = "trips_sources"
@@ -0,0 +1,270 @@
+"""Coordinator fetching the MBTA trips shared by the sensors of a config entry."""
+
+import asyncio
+from dataclasses import dataclass, replace
+from datetime import timedelta
+import functools
+import logging
+from operator import attrgetter
+import time
+from types import MappingProxyType
+from typing import Callable, Mapping
+
+from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
+from homeassistant.util import dt as dt_util
+
+from mbtaclient.handlers.trips_handler import TripsHandler
+from mbtaclient.trip import Trip
+
+_LOGGER = logging.getLogger(__name__)
+
+UPDATE_INTERVAL = timedelta(seconds=30)
+# Slower polling while the next departure is far away, or no trip is running
+SLOW_UPDATE_INTERVAL = timedelta(seconds=60)
+SLOW_DEPARTURE_TIME_TO = timedelta(minutes=30)
+IDLE_UPDATE_INTERVAL = timedelta(minutes=5)
+IDLE_AFTER_EMPTY_UPDATES = 10
+# Trips younger than this are served as is, older ones up to the max age are
+# served while being refreshed in the background. The max age is kept below
+# the update interval, so that only refreshes requested between two scheduled
+# polls serve stale trips and the polls themselves always fetch.
+CACHE_MIN_AGE = 10.0
+CACHE_MAX_AGE = 20.0
+# Last trips served in place of failed updates until they are this old
+STALE_DATA_TTL = 120.0
+
+# Trip fields snapshotted into columns on every refresh
+TRIP_FIELDS = (
+    "name",
+    "headsign",
+    "direction_destination",
+    "direction_name",
+    "duration",
+    "route_name",
+    "route_type",
+    "route_description",
+    "route_color",
+    "vehicle_status",
+    "vehicle_speed",
+    "vehicle_longitude",
+    "vehicle_latitude",
+    "vehicle_updated_at",
+    "departure_stop_name",
+    "departure_platform_name",
+    "departure_status",
+    "departure_time",
+    "departure_deltatime",
+    "departure_countdown",
+    "arrival_stop_name",
+    "arrival_platform_name",
+    "arrival_status",
+    "arrival_time",
+    "arrival_deltatime",
+    "arrival_countdown",
+    "mbta_alerts",
+)
+_trip_fields_getter = attrgetter(*TRIP_FIELDS)
+
+@functools.cache
+def _route_color_hex(route_color: str) -> str:
+    """Return the route color as a hex color code."""
+    return f"#{route_color}"
+
+@dataclass(frozen=True, slots=True)
+class TripsSnapshot:
+    """Immutable result of one coordinator refresh."""
+
+    cols: Mapping[str, list]
+    attrs: Mapping[str, Mapping]
+
+class TripsSource:
+    """Last trips fetched for a trip, shared by the config entries watching it.
+
+    The coordinators of identical config entries reuse the trips fetched by
+    each other instead of querying the MBTA API again.
+    """
+
+    __slots__ = ("trips_handler", "trips", "fetched_at", "_lock")
+
+    def __init__(self, trips_handler: TripsHandler):
+        """Initialize the trips source."""
+        self.trips_handler: TripsHandler = trips_handler
+        self.trips: list[Trip] | None = None
+        self.fetched_at: float = 0.0
+        self._lock = asyncio.Lock()
+
+    async def fetch(self) -> list[Trip]:
+        """Fetch the trips from the MBTA API, one request at a time.
+
+        Callers waiting on the lock reuse the trips fetched by the holder.
+        """
+        async with self._lock:
+            if self.trips is not None and time.monotonic() - self.fetched_at < CACHE_MIN_AGE:
+                return self.trips
+            _LOGGER.debug("Fetching trips data from MBTA API")
+            trips: list[Trip] = await self.trips_handler.update()
+            self.trips = trips
+            self.fetched_at = time.monotonic()
+            return trips
+
+class MBTATripCoordinator(DataUpdateCoordinator[TripsSnapshot]):
+    """Coordinator to manage fetching trips data for sensors."""
+
+    def __init__(self, hass, trips_source: TripsSource):
+        """Initialize the coordinator."""
+        super().__init__(
+            hass,
+            _LOGGER,
+            name="MBTA Trip Data",
+            update_interval=UPDATE_INTERVAL,
+        )
+        self.trips_source: TripsSource = trips_source
+        self._last_good_at: float = 0.0
+        self._empty_updates: int = 0
+        self._revalidate_task: asyncio.Task | None = None
+        self._attrs_builders: dict[str, Callable[[Mapping[str, list]], dict]] = {}
+
+    def register_attributes(self, sensor_key: str, build_fn: Callable[[Mapping[str, list]], dict]):
+        """Register the builder of a sensor's extra attributes.
+
+        Attributes are rebuilt once per refresh and served read-only to the
+        sensors, instead of being recomputed on every state read.
+        """
+        self._attrs_builders[sensor_key] = build_fn
+        if self.data is not None:
+            attrs = dict(self.data.attrs)
+            attrs[sensor_key] = MappingProxyType(build_fn(self.data.cols))
+            self.data = replace(self.data, attrs=MappingProxyType(attrs))
+
+    def unregister_attributes(self, sensor_key: str):
+        """Stop building the extra attributes of a removed sensor."""
+        self._attrs_builders.pop(sensor_key, None)
+        if self.data is not None and sensor_key in self.data.attrs:
+            attrs = dict(self.data.attrs)
+            del attrs[sensor_key]
+            self.data = replace(self.data, attrs=MappingProxyType(attrs))
+
+    def _build_snapshot(self, trips: list[Trip]) -> TripsSnapshot:
+        """Build the snapshot of the latest trips read by the sensors.
+
+        The trips are read into one column per field in a single pass, the
+        derived values and the extra attributes are precomputed alongside.
+        """
+        cols = dict(zip(TRIP_FIELDS, map(list, zip(*map(_trip_fields_getter, trips)))))
+        cols["route_color_hex"] = [
+            _route_color_hex(color) if color else None for color in cols["route_color"]
+        ]
+        # Times to departure and arrival are computed against a single clock
+        now = dt_util.utcnow()
+        cols["departure_time_to"] = [t - now if t else None for t in cols["departure_time"]]
+        cols["arrival_time_to"] = [t - now if t else None for t in cols["arrival_time"]]
+        cols["vehicle_updated_naive"] = [
+            updated_at.replace(tzinfo=None) if updated_at else None
+            for updated_at in cols["vehicle_updated_at"]
+        ]
+        self._last_good_at = time.monotonic()
+        return TripsSnapshot(
+            cols=MappingProxyType(cols),
+            attrs=MappingProxyType({
+                sensor_key: MappingProxyType(build_fn(cols))
+                for sensor_key, build_fn in self._attrs_builders.items()
+            }),
+        )
+
+    def _process_trips(self, trips: list[Trip]) -> TripsSnapshot | None:
+        """Build the snapshot of fetched trips and adapt the polling to it.
+
+        Return None when no trip was returned.
+        """
+        if not trips:
+            self._empty_updates += 1
+            self._adapt_update_interval(None)
+            return None
+        self._empty_updates = 0
+        data = self._build_snapshot(trips)
+        self._adapt_update_interval(data)
+        return data
+
+    async def _revalidate(self):
+        """Refresh the trips in the background and push them to the sensors."""
+        try:
+            trips = await self.trips_source.fetch()
+        except Exception as err:
+            _LOGGER.debug("Background trips refresh failed: %s", err)
+            return
+        finally:
+            self._revalidate_task = None
+        if (data := self._process_trips(trips)) is not None:
+            self.async_set_updated_data(data)
+
+    async def _cached_update(self) -> list[Trip]:
+        """Return the trips, serving the last response while it is fresh enough.
+
+        Trips younger than CACHE_MIN_AGE are reused as is. Trips younger than
+        CACHE_MAX_AGE are returned immediately while a single background
+        refresh fetches new ones. Older trips are refetched before returning.
+        """
+        source = self.trips_source
+        if source.trips is not None:
+            age = time.monotonic() - source.fetched_at
+            if age < CACHE_MIN_AGE:
+                _LOGGER.debug("Reusing trips data fetched %.1fs ago", age)
+                return source.trips
+            if age < CACHE_MAX_AGE:
+                if self._revalidate_task is None:
+                    _LOGGER.debug("Serving trips data fetched %.1fs ago, refreshing", age)
+                    self._revalidate_task = self.hass.async_create_background_task(
+                        self._revalidate(), name="MBTA trips refresh"
+                    )
+                return source.trips
+        return await self.trips_source.fetch()
+
+    async def async_shutdown(self):
+        """Cancel the background refresh and shut down the coordinator."""
+        if self._revalidate_task is not None:
+            self._revalidate_task.cancel()
+            self._revalidate_task = None
+        await super().async_shutdown()
+
+    def _stale_data(self, err: Exception) -> TripsSnapshot | None:
+        """Return the last trips if recent enough to be served in place of a failed update."""
+        if self.data is not None and time.monotonic() - self._last_good_at < STALE_DATA_TTL:
+            _LOGGER.debug("MBTA update failed, serving the last trips data: %s", err)
+            return self.data
+        return None
+
+    def _adapt_update_interval(self, data: TripsSnapshot | None):
+        """Poll less often while the next departure is far away or no trip is running."""
+        if data is None:
+            if self._empty_updates >= IDLE_AFTER_EMPTY_UPDATES:
+                interval = IDLE_UPDATE_INTERVAL
+            else:
+                interval = UPDATE_INTERVAL
+        elif (time_to := data.cols["departure_time_to"][0]) and time_to > SLOW_DEPARTURE_TIME_TO:
+            interval = SLOW_UPDATE_INTERVAL
+        else:
+            interval = UPDATE_INTERVAL
+        if interval != self.update_interval:
+            _LOGGER.debug("Polling every %s", interval)
+            self.update_interval = interval
+
+    async def _async_update_data(self):
+        """Fetch data from the MBTA API.
+
+        Transient fetch errors are hidden by serving the last trips for up to
+        STALE_DATA_TTL, so the sensors do not flap to unavailable. An empty
+        response means no trip is running and fails the update right away.
+        """
+        try:
+            trips: list[Trip] = await self._cached_update()
+        except Exception as err:
+            self.trips_source.trips = None
+            if (data := self._stale_data(err)) is not None:
+                return data
+            _LOGGER.debug("MBTA fetch error", exc_info=True)
+            raise UpdateFailed(f"Error fetching trips data: {err}") from err
+        if (data := self._process_trips(trips)) is None:
+            # DataUpdateCoordinator logs the failure itself
+            self.trips_source.trips = None
+            raise UpdateFailed("No trips returned from the MBTA API.")
+        return data
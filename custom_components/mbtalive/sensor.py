@@ -1,1089 +1,630 @@
 from datetime import timedelta
+import functools
+from itertools import islice
 import logging
+from typing import Callable, Final, Mapping
 
 from homeassistant.components.sensor import (
     SensorDeviceClass,
     SensorEntity,
+    SensorStateClass,
 )
-from homeassistant.const import UnitOfTime
-from homeassistant.core import HomeAssistant
+from homeassistant.const import UnitOfSpeed, UnitOfTime
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
 from homeassistant.helpers.entity import generate_entity_id
+from homeassistant.util import slugify
 
-from mbtaclient.handlers.trips_handler import TripsHandler
-from mbtaclient.client.mbta_client  import MBTAClient
-from mbtaclient.client.mbta_cache_manager  import MBTACacheManager
-from mbtaclient.trip import Trip
-from mbtaclient.stop import StopType
+from .const import DOMAIN
+from .coordinator import MBTATripCoordinator, TripsSnapshot
 
 _LOGGER = logging.getLogger(__name__)
 
-class MBTATripCoordinator(DataUpdateCoordinator):
-    """Coordinator to manage fetching trips data for sensors."""
-
-    def __init__(self, hass, trips_handler: TripsHandler):
-        """Initialize the coordinator."""
-        super().__init__(
-            hass,
-            _LOGGER,
-            name="MBTA Trip Data",
-            update_interval=timedelta(seconds=30),
-        )
-        self.trips_handler: TripsHandler = trips_handler
-
-    async def _async_update_data(self):
-        """Fetch data from the MBTA API."""
-        try:
-            _LOGGER.debug("Fetching trips data from MBTA API")
-            trips: list[Trip] = await self.trips_handler.update()
-            if not trips:
-                raise UpdateFailed("No trips returned from the MBTA API.")
-            return trips
-        except UpdateFailed as e:
-            _LOGGER.error(f"Update failed: {e}")
-            raise  # Re-raise to propagate the error
-        except Exception as err:
-            _LOGGER.error(f"Error fetching trips data: {err}")
-            raise UpdateFailed(f"Error fetching trips data: {err}")
-
-class MBTABaseTripSensor(SensorEntity):
-    """Base class for MBTA trip sensors."""
+def _minutes(delta: timedelta) -> int:
+    """Return a duration in whole minutes, rounded to the nearest minute."""
+    return (int(delta.total_seconds()) + 30) // 60
+
+# Maximum number of next trips listed in the extra attributes
+MAX_NEXT = 5
+
+def _add_next(attributes: dict, column: list, fmt: Callable | None = None) -> dict:
+    """Add the non-empty values of the next trips to the extra attributes."""
+    if len(column) < 2:
+        return attributes
+    if fmt is None:
+        next = [v for v in islice(column, 1, 1 + MAX_NEXT) if v]
+    else:
+        next = [fmt(v) for v in islice(column, 1, 1 + MAX_NEXT) if v]
+    if next:
+        attributes["next"] = next
+    return attributes
+
+def _minutes_str(delta: timedelta) -> str:
+    """Return a duration formatted as whole minutes."""
+    return f"{_minutes(delta)}m"
+
+def _time_to_minutes(delta: timedelta) -> int:
+    """Return a time to departure or arrival in whole minutes, 0 once passed."""
+    return max(0, _minutes(delta))
+
+def _time_to_str(delta: timedelta) -> str:
+    """Return a time to departure or arrival formatted as whole minutes, 0 once passed."""
+    return f"{_time_to_minutes(delta)}m"
+
+class MBTABaseTripSensor(CoordinatorEntity[MBTATripCoordinator], SensorEntity):
+    """Base class for MBTA trip sensors.
+
+    The state and the extra attributes are pushed into _attr_native_value and
+    _attr_extra_state_attributes on every coordinator update.
+    """
+
+    # Only the attributes owned by this integration are slotted: the other
+    # _attr_* names are class attributes managed by the HA Entity base.
+    __slots__ = ("_attr_config_entry_id", "_sensor_name", "_written")
+
+    # Trips column reported as state, empty values are reported as unknown,
+    # and the formatter of its values listed for the next trips
+    _FIELD: str | None = None
+    _NEXT_FMT: Callable | None = None
 
     def __init__(
         self,
-        config_entry_name,
         config_entry_id,
         coordinator,
         sensor_name,
-        icon):
+        icon,
+        entity_id_format,
+        device_info):
         """Initialize the base sensor."""
-
+        super().__init__(coordinator)
         self._attr_config_entry_id = config_entry_id  # Link entity to config entry
-        self._coordinator = coordinator
         self._attr_unique_id = f"{config_entry_id}-{sensor_name}"  # Unique ID for the entity
         self._sensor_name = sensor_name
         self.entity_id = generate_entity_id(
-            "sensor.{}",
-            f"({config_entry_name}_{sensor_name})",
-            hass=self._coordinator.hass
+            entity_id_format,
+            sensor_name,
+            hass=coordinator.hass
         )
-        self._attr_device_info = {
-            "identifiers": {(config_entry_id,)},
-            "name": config_entry_name,
-            "model": "MBTA Live Trip Info",
-        }
-        self._attr_icon = icon 
-
-    @property
-    def device_class(self):
-        """Return the device class for the sensor."""
-        return None
-
-    @property
-    def unit_of_measurement(self):
-        """Return the unit of measurement for the sensor."""
-        return None
-
-    @property
-    def name(self):
-        """Return the name of the sensor."""
-        return f"{self._sensor_name}"
-
-    @property
-    def available(self):
-        """Return if the sensor is available."""
-        return self._coordinator.last_update_success
-
-    @property
-    def icon(self):
-        """Return the icon for the sensor."""
-        return self._attr_icon
+        self._attr_device_info = device_info
+        self._attr_name = sensor_name
+        self._attr_icon = icon
+        self._written = None
+
+    async def async_added_to_hass(self) -> None:
+        """Register the attributes builder once the sensor is added.
+
+        Sensors disabled in the entity registry are never added, so their
+        attributes are not built on refreshes.
+        """
+        await super().async_added_to_hass()
+        self.coordinator.register_attributes(self._sensor_name, self._build_attributes)
+        self.async_on_remove(
+            functools.partial(self.coordinator.unregister_attributes, self._sensor_name)
+        )
+        self._update_values()
 
-    async def async_update(self):
-        """Fetch the latest data from the coordinator."""
-        await self._coordinator.async_request_refresh()
+    def _native_value(self, data: TripsSnapshot):
+        """Return the state of the sensor."""
+        if self._FIELD is None:
+            return None
+        return data.cols[self._FIELD][0] or None
+
+    @classmethod
+    def _build_attributes(cls, cols: Mapping[str, list]) -> dict:
+        """Build extra attributes from the latest trips columns.
+
+        Lists the state column of the next trips by default.
+        """
+        if cls._FIELD is None:
+            return {}
+        return _add_next({}, cols[cls._FIELD], cls._NEXT_FMT)
+
+    def _update_values(self):
+        """Update the state and the extra attributes from the coordinator data."""
+        data = self.coordinator.data
+        self._attr_native_value = self._native_value(data)
+        self._attr_extra_state_attributes = data.attrs.get(self._sensor_name)
+
+    @callback
+    def _handle_coordinator_update(self):
+        """Write the state only if the sensor changed since the last write."""
+        self._update_values()
+        written = (self.available, self._attr_native_value, self._attr_extra_state_attributes)
+        if written == self._written:
+            return
+        self._written = written
+        self.async_write_ha_state()
 
 
 #TRIP
 class MBTANameSensor(MBTABaseTripSensor):
     """Sensor for trip name."""
 
-    @property
-    def state(self):
-        """Return the state of the sensor."""
-        if self._coordinator.data:
-            trip: Trip = self._coordinator.data[0]
-            if trip.name:
-                return trip.name
-        return None
+    __slots__ = ()
+
+    _FIELD = "name"
 
-    @property
-    def extra_state_attributes(self):
-        """Return extra attributes."""
-        if self._coordinator.data and len(self._coordinator.data) > 0:
-            attributes = {}
-            next = []
-            for item in self._coordinator.data[1:]:
-                if item.name:
-                    next.append(item.name)
-            if len(next) >0:
-                attributes["next"] = next
-            return attributes  # Return the dictionary of attributes
-        
 class MBTAHeadsignSensor(MBTABaseTripSensor):
     """Sensor for trip headsign."""
 
-    @property
-    def state(self):
-        """Return the state of the sensor."""
-        if self._coordinator.data:
-            trip: Trip = self._coordinator.data[0]
-            if trip.headsign:
-                return trip.headsign
-        return None
+    __slots__ = ()
 
-    @property
-    def extra_state_attributes(self):
-        """Return extra attributes."""
-        if self._coordinator.data:
-            attributes = {}
-            trip: Trip = self._coordinator.data[0]    
-            if trip.direction_destination:
-                attributes["destination"]  = trip.direction_destination
-            if trip.direction_name:
-                attributes["direction"]  = trip.direction_name
-            if len(self._coordinator.data) > 0:
-                next = []
-                for item in self._coordinator.data[1:]:
-                    if item.headsign:
-                        next.append(item.headsign)
-                if len(next) >0:
-                    attributes["next"] = next
-            return attributes  # Return the dictionary of attributes
+    _FIELD = "headsign"
 
-        return None
+    @staticmethod
+    def _build_attributes(cols: Mapping[str, list]) -> dict:
+        """Build extra attributes from the latest trips columns."""
+        attributes = {}
+        if value := cols["direction_destination"][0]:
+            attributes["destination"] = value
+        if value := cols["direction_name"][0]:
+            attributes["direction"] = value
+        return _add_next(attributes, cols["headsign"])
 
 class MBTADestinationSensor(MBTABaseTripSensor):
     """Sensor for trip destination."""
 
-    _attr_entity_registry_enabled_default = False  # This keeps the sensor disabled by default
+    __slots__ = ()
 
-    @property
-    def state(self):
-        """Return the state of the sensor."""
-        if self._coordinator.data:
-            trip: Trip = self._coordinator.data[0]
-            if trip.direction_destination:
-                return trip.direction_destination
-        return None
+    _attr_entity_registry_enabled_default = False  # This keeps the sensor disabled by default
+    _FIELD = "direction_destination"
 
-    @property
-    def extra_state_attributes(self):
-        """Return extra attributes."""
-        if self._coordinator.data and len(self._coordinator.data) > 0:
-            attributes = {}
-            next = []
-            for item in self._coordinator.data[1:]:
-                if item.direction_destination:
-                    next.append(item.direction_destination)
-            if len(next) >0:
-                attributes["next"] = next
-            return attributes  # Return the dictionary of attributes
-        
 class MBTADirectionSensor(MBTABaseTripSensor):
     """Sensor for trip direction."""
 
-    _attr_entity_registry_enabled_default = False  # This keeps the sensor disabled by default
+    __slots__ = ()
 
-    @property
-    def state(self):
-        """Return the state of the sensor."""
-        if self._coordinator.data:
-            trip: Trip = self._coordinator.data[0]
-            if trip.direction_name:
-                return trip.direction_name
-        return None
+    _attr_entity_registry_enabled_default = False  # This keeps the sensor disabled by default
+    _FIELD = "direction_name"
 
-    @property
-    def extra_state_attributes(self):
-        """Return extra attributes."""
-        if self._coordinator.data and len(self._coordinator.data) > 0:
-            attributes = {}
-            next = []
-            for item in self._coordinator.data[1:]:
-                if item.direction_name:
-                    next.append(item.direction_name)
-            if len(next) >0:
-                attributes["next"] = next
-            return attributes  # Return the dictionary of attributes
-        
 class MBTADurationSensor(MBTABaseTripSensor):
     """Sensor for departure time."""        
 
-    @property
-    def state(self):
+    __slots__ = ()
+
+    _attr_device_class = SensorDeviceClass.DURATION
+    _attr_native_unit_of_measurement = UnitOfTime.MINUTES
+    _FIELD = "duration"
+    _NEXT_FMT = staticmethod(_minutes)
+
+    @staticmethod
+    def _native_value(data: TripsSnapshot):
         """Return the state of the sensor."""
-        if self._coordinator.data:
-            trip: Trip = self._coordinator.data[0]
-            if trip.duration:
-                return round(trip.duration.total_seconds() / 60,0)
+        if value := data.cols["duration"][0]:
+            return _minutes(value)
         return None
 
-    @property
-    def device_class(self):
-        """Return the device class for the sensor."""
-        return SensorDeviceClass.DURATION
-
-    @property
-    def unit_of_measurement(self):
-        """Return the unit of measurement for the sensor."""
-        return UnitOfTime.MINUTES
-
-    @property
-    def extra_state_attributes(self):
-        """Return extra attributes."""
-        if self._coordinator.data and len(self._coordinator.data) > 0:
-            attributes = {}
-            next = []
-            for item in self._coordinator.data[1:]:
-                if item.duration:
-                    next.append(round(item.duration.total_seconds() / 60,0))
-            if len(next) >0:
-                attributes["next"] = next
-            return attributes  # Return the dictionary of attributes
-        
 #ROUTE
 class MBTARouteNameSensor(MBTABaseTripSensor):
     """Sensor for trip route name."""
 
-    @property
-    def state(self):
-        """Return the state of the sensor."""
-        if self._coordinator.data:
-            trip: Trip = self._coordinator.data[0]
-            if trip.route_name:
-                return trip.route_name
-        return None
+    __slots__ = ()
 
-    @property
-    def extra_state_attributes(self):
-        """Return extra attributes."""
-        if self._coordinator.data:
-            trip: Trip = self._coordinator.data[0]
-            attributes = {}
-            if trip.route_description:
-                attributes["type"] = trip.route_description
-            if trip.route_color:
-                attributes["color"] = f"#{trip.route_color}"
-            if len(self._coordinator.data) > 0:
-                next = []
-                for item in self._coordinator.data[1:]:
-                    if item.route_name:
-                        next.append(item.route_name)
-                if len(next) >0:
-                    attributes["next"] = next
-            return attributes  # Return the dictionary of attributes
+    _FIELD = "route_name"
 
-        return None
+    @staticmethod
+    def _build_attributes(cols: Mapping[str, list]) -> dict:
+        """Build extra attributes from the latest trips columns."""
+        attributes = {}
+        if value := cols["route_description"][0]:
+            attributes["type"] = value
+        if value := cols["route_color_hex"][0]:
+            attributes["color"] = value
+        return _add_next(attributes, cols["route_name"])
 
 class MBTARouteTypeSensor(MBTABaseTripSensor):
     """Sensor for route type."""
 
-    _attr_entity_registry_enabled_default = False  # This keeps the sensor disabled by default
+    __slots__ = ()
 
-    @property
-    def state(self):
-        """Return the state of the sensor."""
-        if self._coordinator.data:
-            trip: Trip = self._coordinator.data[0]
-            if trip.route_description:
-                return trip.route_description
-        return None
+    _attr_entity_registry_enabled_default = False  # This keeps the sensor disabled by default
+    _FIELD = "route_description"
 
-    @property
-    def extra_state_attributes(self):
-        """Return extra attributes."""
-        if self._coordinator.data and len(self._coordinator.data) > 0:
-            attributes = {}
-            next = []
-            for item in self._coordinator.data[1:]:
-                if item.route_description:
-                    next.append(item.route_description)
-            if len(next) >0:
-                attributes["next"] = next
-            return attributes  # Return the dictionary of attributes
-      
 class MBTARouteColorSensor(MBTABaseTripSensor):
     """Sensor for route type."""
 
-    _attr_entity_registry_enabled_default = False  # This keeps the sensor disabled by default
+    __slots__ = ()
 
-    @property
-    def state(self):
-        """Return the state of the sensor."""
-        if self._coordinator.data:
-            trip: Trip = self._coordinator.data[0]
-            if trip.route_color:
-                return f"#{trip.route_color}"
-        return None
+    _attr_entity_registry_enabled_default = False  # This keeps the sensor disabled by default
+    _FIELD = "route_color_hex"
 
-    @property
-    def extra_state_attributes(self):
-        """Return extra attributes."""
-        if self._coordinator.data and len(self._coordinator.data) > 0:
-            attributes = {}
-            next = []
-            for item in self._coordinator.data[1:]:
-                if item.route_color:
-                    next.append(f"#{item.route_color}")
-            if len(next) >0:
-                attributes["next"] = next
-            return attributes  # Return the dictionary of attributes  
-        
-        
 #VEHICLE
 class MBTAVehicleStatusSensor(MBTABaseTripSensor):
     """Sensor for vehicle status."""
 
-    @property
-    def state(self):
-        """Return the state of the sensor."""
-        if self._coordinator.data:
-            trip: Trip = self._coordinator.data[0]
-            if trip.vehicle_status:
-                return trip.vehicle_status
-        return "unavailable"
-
-    @property
-    def extra_state_attributes(self):
-        """Return extra attributes."""
-        if self._coordinator.data:
-            trip: Trip = self._coordinator.data[0]
-            attributes = {}
-            if trip.vehicle_updated_at:
-                attributes["updated_at"]  = trip.vehicle_updated_at.replace(tzinfo=None)
-            if len(self._coordinator.data) > 0:
-                next = []
-                for item in self._coordinator.data[1:]:
-                    if item.vehicle_status:
-                        next.append(item.vehicle_status)
-                if len(next) >0:
-                    attributes["next"] = next
-            return attributes  # Return the dictionary of attributes
+    __slots__ = ()
 
-        return None
+    _FIELD = "vehicle_status"
+
+    @staticmethod
+    def _build_attributes(cols: Mapping[str, list]) -> dict:
+        """Build extra attributes from the latest trips columns."""
+        attributes = {}
+        if value := cols["vehicle_updated_naive"][0]:
+            attributes["updated_at"] = value
+        return _add_next(attributes, cols["vehicle_status"])
 
 class MBTAVehicleSpeedSensor(MBTABaseTripSensor):
     """Sensor for vehicle speed."""
 
+    __slots__ = ()
+
     _attr_entity_registry_enabled_default = False  # This keeps the sensor disabled by default
-    
-    @property
-    def state(self):
-        """Return the state of the sensor."""
-        if self._coordinator.data:
-            trip: Trip = self._coordinator.data[0]
-            if trip.vehicle_speed:
-                return trip.vehicle_speed
-        return "unavailable"
-
-    @property
-    def device_class(self):
-        """Return the device class for the sensor."""
-        return SensorDeviceClass.SPEED
-
-    @property
-    def unit_of_measurement(self):
-        """Return the unit of measurement for the sensor."""
-        return "mph"
-
-    @property
-    def extra_state_attributes(self):
-        """Return extra attributes."""
-        if self._coordinator.data:
-            trip: Trip = self._coordinator.data[0]
-            attributes = {}
-            if trip.vehicle_updated_at:
-                attributes["updated_at"]  = trip.vehicle_updated_at.replace(tzinfo=None)
-            if len(self._coordinator.data) > 0:
-                next = []
-                for item in self._coordinator.data[1:]:
-                    if item.vehicle_speed:
-                        next.append(item.vehicle_speed)
-                if len(next) >0:
-                    attributes["next"] = next
-            return attributes  # Return the dictionary of attributes
+    _attr_device_class = SensorDeviceClass.SPEED
+    _attr_native_unit_of_measurement = UnitOfSpeed.METERS_PER_SECOND
+    _attr_state_class = SensorStateClass.MEASUREMENT
+    _FIELD = "vehicle_speed"
+
+    @staticmethod
+    def _native_value(data: TripsSnapshot):
+        """Return the state of the sensor, a stopped vehicle reporting 0."""
+        return data.cols["vehicle_speed"][0]
+
+    @staticmethod
+    def _build_attributes(cols: Mapping[str, list]) -> dict:
+        """Build extra attributes from the latest trips columns."""
+        attributes = {}
+        if value := cols["vehicle_updated_naive"][0]:
+            attributes["updated_at"] = value
+        next = [v for v in islice(cols["vehicle_speed"], 1, 1 + MAX_NEXT) if v is not None]
+        if next:
+            attributes["next"] = next
+        return attributes
 
-        return None
-    
 class MBTAVehicleLonSensor(MBTABaseTripSensor):
     """Sensor for vehicle longitude."""
 
+    __slots__ = ()
+
     _attr_entity_registry_enabled_default = False  # This keeps the sensor disabled by default
-    
-    @property
-    def state(self):
-        """Return the state of the sensor."""
-        if self._coordinator.data:
-            trip: Trip = self._coordinator.data[0]
-            if trip.vehicle_longitude:
-                return trip.vehicle_longitude
-        return "unavailable"
-
-    @property
-    def unit_of_measurement(self):
-        """Return the unit of measurement for the sensor."""
-        return "°"  # Degrees symbol for geographic coordinates
-
-    @property
-    def extra_state_attributes(self):
-        """Return extra attributes."""
-        if self._coordinator.data:
-            trip: Trip = self._coordinator.data[0]
-            attributes = {}
-            if trip.vehicle_updated_at:
-                attributes["updated_at"]  = trip.vehicle_updated_at.replace(tzinfo=None)
-            if len(self._coordinator.data) > 0:
-                next = []
-                for item in self._coordinator.data[1:]:
-                    if item.vehicle_longitude:
-                        next.append(item.vehicle_longitude)
-                if len(next) >0:
-                    attributes["next"] = next
-            return attributes  # Return the dictionary of attributes
+    _attr_native_unit_of_measurement = "°"
+    _FIELD = "vehicle_longitude"
 
-        return None
+    @staticmethod
+    def _build_attributes(cols: Mapping[str, list]) -> dict:
+        """Build extra attributes from the latest trips columns."""
+        attributes = {}
+        if value := cols["vehicle_updated_naive"][0]:
+            attributes["updated_at"] = value
+        return _add_next(attributes, cols["vehicle_longitude"])
 
 class MBTAVehicleLatSensor(MBTABaseTripSensor):
     """Sensor for vehicle longlatitude."""
 
+    __slots__ = ()
+
     _attr_entity_registry_enabled_default = False  # This keeps the sensor disabled by default
-    
-    @property
-    def state(self):
-        """Return the state of the sensor."""
-        if self._coordinator.data:
-            trip: Trip = self._coordinator.data[0]
-            if trip.vehicle_latitude:
-                return trip.vehicle_latitude
-        return "unavailable"
-
-    @property
-    def unit_of_measurement(self):
-        """Return the unit of measurement for the sensor."""
-        return "°"  # Degrees symbol for geographic coordinates
-        
-    @property
-    def extra_state_attributes(self):
-        """Return extra attributes."""
-        if self._coordinator.data:
-            trip: Trip = self._coordinator.data[0]
-            attributes = {}
-            if trip.vehicle_updated_at:
-                 attributes["updated_at"]  = trip.vehicle_updated_at.replace(tzinfo=None)
-            if len(self._coordinator.data) > 0:
-                next = []
-                for item in self._coordinator.data[1:]:
-                    if item.vehicle_latitude:
-                        next.append(item.vehicle_latitude)
-                if len(next) >0:
-                    attributes["next"] = next
-            return attributes  # Return the dictionary of attributes
-        return None
+    _attr_native_unit_of_measurement = "°"
+    _FIELD = "vehicle_latitude"
+
+    @staticmethod
+    def _build_attributes(cols: Mapping[str, list]) -> dict:
+        """Build extra attributes from the latest trips columns."""
+        attributes = {}
+        if value := cols["vehicle_updated_naive"][0]:
+            attributes["updated_at"] = value
+        return _add_next(attributes, cols["vehicle_latitude"])
 
 class MBTAVehicleLastUpdateSensor(MBTABaseTripSensor):
     """Sensor for vehicle last update."""
 
+    __slots__ = ()
+
     _attr_entity_registry_enabled_default = False  # This keeps the sensor disabled by default
+    _FIELD = "vehicle_updated_naive"
 
-    @property
-    def state(self):
-        """Return the state of the sensor."""
-        if self._coordinator.data:
-            trip: Trip = self._coordinator.data[0]
-            if trip.vehicle_updated_at:
-                return trip.vehicle_updated_at.replace(tzinfo=None)
-        return "unavailable"
-
-    @property
-    def extra_state_attributes(self):
-        """Return extra attributes."""
-        if self._coordinator.data and len(self._coordinator.data) > 0:
-            attributes = {}
-            next = []
-            for item in self._coordinator.data[1:]:
-                if item.vehicle_updated_at:
-                    next.append(item.vehicle_updated_at.replace(tzinfo=None))
-                if len(next) >0:
-                    attributes["next"] = next
-            return attributes  # Return the dictionary of attributes
-        
 #DEPARTURE STOP
 class MBTADepartureNameSensor(MBTABaseTripSensor):
     """Sensor for departure stop name."""
 
-    @property
-    def state(self):
-        """Return the state of the sensor."""
-        if self._coordinator.data:
-            trip: Trip = self._coordinator.data[0]
-            if trip.departure_stop_name:
-                return trip.departure_stop_name
-        return None
+    __slots__ = ()
+
+    _FIELD = "departure_stop_name"
+
+    @staticmethod
+    def _build_attributes(cols: Mapping[str, list]) -> dict:
+        """Build extra attributes from the latest trips columns."""
+        attributes = {}
+        if value := cols["departure_platform_name"][0]:
+            attributes["platform"] = value
+        if value := cols["departure_status"][0]:
+            attributes["live update"] = value
+        return attributes
 
-    @property
-    def extra_state_attributes(self):
-        """Return extra attributes."""
-        if self._coordinator.data:
-            trip: Trip = self._coordinator.data[0]
-            attributes = {}
-            if trip.departure_platform_name:
-                attributes["platform"]  = trip.departure_platform_name
-            if trip.departure_status:
-                attributes["live update"] = trip.departure_status
-            return attributes  # Return the dictionary of attributes
-        return None
-    
 class MBTADeparturePlatformSensor(MBTABaseTripSensor):
     """Sensor for departure platform name.."""
 
-    @property
-    def state(self):
-        """Return the state of the sensor."""
-        if self._coordinator.data:
-            trip: Trip = self._coordinator.data[0]
-            if trip.departure_platform_name:
-                return trip.departure_platform_name
-        return None
+    __slots__ = ()
+
+    _FIELD = "departure_platform_name"
 
-    @property
-    def extra_state_attributes(self):
-        """Return extra attributes."""
-        if self._coordinator.data and len(self._coordinator.data) > 0:
-            attributes = {}
-            next = []
-            for item in self._coordinator.data[1:]:
-                if item.departure_platform_name:
-                    next.append(item.departure_platform_name)
-            if len(next) >0:
-                attributes["next"] = next
-            return attributes  # Return the dictionary of attributes
-        
 class MBTADepartureTimeSensor(MBTABaseTripSensor):
     """Sensor for departure time."""        
 
-    @property
-    def state(self):
-        """Return the state of the sensor."""
-        if self._coordinator.data:
-            trip: Trip = self._coordinator.data[0]
-            if trip.departure_time:
-                return trip.departure_time.replace(tzinfo=None)
-        return None
+    __slots__ = ()
 
-    @property
-    def device_class(self):
-        """Return the device class for the sensor."""
-        # Use None or other device classes based on the data.
-        SensorDeviceClass.TIMESTAMP 
-
-    @property
-    def extra_state_attributes(self):
-        """Return extra attributes."""
-        if self._coordinator.data:
-            trip: Trip = self._coordinator.data[0]
-            attributes = {}
-            if trip.departure_deltatime:
-                 attributes["delay"]  = f"{int(round(trip.departure_deltatime.total_seconds() / 60,0))}m"
-            if trip.departure_time_to:
-                 attributes["time to"]  = f"{int(round(trip.departure_time_to.total_seconds() / 60,0))}m"
-            if len(self._coordinator.data) > 0:
-                next = []
-                for item in self._coordinator.data[1:]:
-                    if item.departure_time:
-                        next.append(item.departure_time.replace(tzinfo=None))
-                if len(next) >0:
-                    attributes["next"] = next
-            return attributes  # Return the dictionary of attributes
-        return None
+    _attr_device_class = SensorDeviceClass.TIMESTAMP
+    _FIELD = "departure_time"
+
+    @staticmethod
+    def _build_attributes(cols: Mapping[str, list]) -> dict:
+        """Build extra attributes from the latest trips columns."""
+        attributes = {}
+        if value := cols["departure_deltatime"][0]:
+            attributes["delay"] = _minutes_str(value)
+        if value := cols["departure_time_to"][0]:
+            attributes["time to"] = _time_to_str(value)
+        return _add_next(attributes, cols["departure_time"])
 
 class MBTADepartureDelaySensor(MBTABaseTripSensor):
     """Sensor for departure delay."""
 
+    __slots__ = ()
+
     _attr_entity_registry_enabled_default = False  # This keeps the sensor disabled by default
+    _attr_device_class = SensorDeviceClass.DURATION
+    _attr_native_unit_of_measurement = UnitOfTime.MINUTES
+    _FIELD = "departure_deltatime"
+    _NEXT_FMT = staticmethod(_minutes_str)
 
-    @property
-    def state(self):
+    @staticmethod
+    def _native_value(data: TripsSnapshot):
         """Return the state of the sensor."""
-        if self._coordinator.data:
-            trip: Trip = self._coordinator.data[0]
-            if trip.departure_deltatime:
-                return round(trip.departure_deltatime.total_seconds() / 60,0)
+        if value := data.cols["departure_deltatime"][0]:
+            return _minutes(value)
         return None
 
-    @property
-    def device_class(self):
-        """Return the device class for the sensor."""
-        return SensorDeviceClass.DURATION
-
-    @property
-    def unit_of_measurement(self):
-        """Return the unit of measurement for the sensor."""
-        return UnitOfTime.MINUTES
-
-    @property
-    def extra_state_attributes(self):
-        """Return extra attributes."""
-        if self._coordinator.data and len(self._coordinator.data) > 0:
-            attributes = {}
-            next = []
-            for item in self._coordinator.data[1:]:
-                if item.departure_deltatime:
-                    next.append(f"{int(round(item.departure_deltatime.total_seconds() / 60,0))}m")
-            if len(next) >0:
-                attributes["next"] = next
-            return attributes  # Return the dictionary of attributes
-        
 class MBTADepartureTimeToSensor(MBTABaseTripSensor):
     """Sensor for departure time to."""
 
+    __slots__ = ()
+
     _attr_entity_registry_enabled_default = False  # This keeps the sensor disabled by default
+    _attr_device_class = SensorDeviceClass.DURATION
+    _attr_native_unit_of_measurement = UnitOfTime.MINUTES
+    _FIELD = "departure_time_to"
+    _NEXT_FMT = staticmethod(_time_to_str)
 
-    @property
-    def state(self):
+    @staticmethod
+    def _native_value(data: TripsSnapshot):
         """Return the state of the sensor."""
-        if self._coordinator.data:
-            trip: Trip = self._coordinator.data[0]
-            if trip.departure_time_to:
-                time_to = round(trip.departure_time_to.total_seconds() / 60,0)
-                if time_to >= 0:
-                    return time_to
-                elif time_to < 0:
-                    return 0
+        if value := data.cols["departure_time_to"][0]:
+            return _time_to_minutes(value)
         return None
 
-    @property
-    def device_class(self):
-        """Return the device class for the sensor."""
-        return SensorDeviceClass.DURATION
-
-    @property
-    def unit_of_measurement(self):
-        """Return the unit of measurement for the sensor."""
-        return UnitOfTime.MINUTES
-
-    @property
-    def extra_state_attributes(self):
-        """Return extra attributes."""
-        if self._coordinator.data and len(self._coordinator.data) > 0:
-            attributes = {}
-            next = []
-            for item in self._coordinator.data[1:]:
-                if item.departure_time_to:
-                    next.append(f"{int(round(item.departure_time_to.total_seconds() / 60,0))}m")
-            if len(next) >0:
-                attributes["next"] = next
-            return attributes  # Return the dictionary of attributes
-
 class MBTADepartureStatusSensor(MBTABaseTripSensor):
     """Sensor for departure status."""
 
-    @property
-    def state(self):
-        """Return the state of the sensor."""
-        if self._coordinator.data:
-            trip: Trip = self._coordinator.data[0]
-            if trip.departure_status:
-                return trip.departure_status
-        return "unavailable"
-
-    @property
-    def extra_state_attributes(self):
-        """Return extra attributes."""
-        if self._coordinator.data and len(self._coordinator.data) > 0:
-            attributes = {}
-            next = []
-            for item in self._coordinator.data[1:]:
-                if item.departure_status:
-                    next.append(item.departure_status)
-            if len(next) >0:
-                attributes["next"] = next
-            return attributes  # Return the dictionary of attributes
+    __slots__ = ()
+
+    _FIELD = "departure_status"
 
 class MBTADepartureCountdownSensor(MBTABaseTripSensor):
     """Sensor for departure countdown."""
 
+    __slots__ = ()
+
     _attr_entity_registry_enabled_default = False  # This keeps the sensor disabled by default
-    
-    @property
-    def state(self):
-        """Return the state of the sensor."""
-        if self._coordinator.data:
-            trip: Trip = self._coordinator.data[0]
-            if trip.departure_countdown:
-                return trip.departure_countdown
-        return "unavailable"
-
-    @property
-    def extra_state_attributes(self):
-        """Return extra attributes."""
-        if self._coordinator.data and len(self._coordinator.data) > 0:
-            attributes = {}
-            next = []
-            for item in self._coordinator.data[1:]:
-                if item.departure_countdown:
-                    next.append(item.departure_countdown)
-            if len(next) >0:
-                attributes["next"] = next
-            return attributes  # Return the dictionary of attributes
-        
+    _FIELD = "departure_countdown"
+
 #ARRIVAL STOP
 class MBTAArrivalNameSensor(MBTABaseTripSensor):
     """Sensor for arrival stop name."""
 
-    @property
-    def state(self):
-        """Return the state of the sensor."""
-        if self._coordinator.data:
-            trip: Trip = self._coordinator.data[0]
-            if trip.arrival_stop_name:
-                return trip.arrival_stop_name
-        return None
+    __slots__ = ()
 
-    @property
-    def extra_state_attributes(self):
-        """Return extra attributes."""
-        if self._coordinator.data:
-            trip: Trip = self._coordinator.data[0]
-            attributes = {}
-            if trip.arrival_platform_name:
-                 attributes["platform"]  = trip.arrival_platform_name
-            if trip.arrival_status:
-                attributes["status"] = trip.arrival_status
-            return attributes  # Return the dictionary of attributes
+    _FIELD = "arrival_stop_name"
+
+    @staticmethod
+    def _build_attributes(cols: Mapping[str, list]) -> dict:
+        """Build extra attributes from the latest trips columns."""
+        attributes = {}
+        if value := cols["arrival_platform_name"][0]:
+            attributes["platform"] = value
+        if value := cols["arrival_status"][0]:
+            attributes["status"] = value
+        return attributes
 
-        return None
-    
 class MBTAArrivalPlatformSensor(MBTABaseTripSensor):
     """Sensor for arrival platform name.."""
 
-    _attr_entity_registry_enabled_default = False  # This keeps the sensor disabled by default
+    __slots__ = ()
 
-    @property
-    def state(self):
-        """Return the state of the sensor."""
-        if self._coordinator.data:
-            trip: Trip = self._coordinator.data[0]
-            if trip.arrival_platform_name:
-                return trip.arrival_platform_name
-        return None
+    _attr_entity_registry_enabled_default = False  # This keeps the sensor disabled by default
+    _FIELD = "arrival_platform_name"
     
-    @property
-    def extra_state_attributes(self):
-        """Return extra attributes."""
-        if self._coordinator.data and len(self._coordinator.data) > 0:
-            attributes = {}
-            next = []
-            for item in self._coordinator.data[1:]:
-                if item.arrival_platform_name:
-                    next.append(item.arrival_platform_name)
-            if len(next) >0:
-                attributes["next"] = next
-            return attributes  # Return the dictionary of attributes
-
 class MBTAArrivalTimeSensor(MBTABaseTripSensor):
     """Sensor for arrival time."""        
 
-    @property
-    def state(self):
-        """Return the state of the sensor."""
-        if self._coordinator.data:
-            trip: Trip = self._coordinator.data[0]
-            if trip.arrival_time:
-                return trip.arrival_time.replace(tzinfo=None)
-        return None
+    __slots__ = ()
 
-    @property
-    def device_class(self):
-        """Return the device class for the sensor."""
-        # Use None or other device classes based on the data.
-        SensorDeviceClass.TIMESTAMP 
-    
-    @property
-    def extra_state_attributes(self):
-        """Return extra attributes."""
-        if self._coordinator.data:
-            attributes = {}
-            trip: Trip = self._coordinator.data[0]
-            if trip.arrival_deltatime:
-                attributes["delay"] = f"{int(round(trip.arrival_deltatime.total_seconds() / 60,0))}m"
-            if trip.arrival_time_to:
-                attributes["time to"] = f"{int(round(trip.arrival_time_to.total_seconds() / 60,0))}m"
-            if trip.arrival_status:
-                attributes["status"] = trip.arrival_status
-            if len(self._coordinator.data) > 0:
-                next = []
-                for item in self._coordinator.data[1:]:
-                    if item.arrival_time:
-                        next.append(item.arrival_time.replace(tzinfo=None))
-                if len(next) >0:
-                    attributes["next"] = next
-            return attributes  # Return the dictionary of attributes
-        return None
+    _attr_device_class = SensorDeviceClass.TIMESTAMP
+    _FIELD = "arrival_time"
+
+    @staticmethod
+    def _build_attributes(cols: Mapping[str, list]) -> dict:
+        """Build extra attributes from the latest trips columns."""
+        attributes = {}
+        if value := cols["arrival_deltatime"][0]:
+            attributes["delay"] = _minutes_str(value)
+        if value := cols["arrival_time_to"][0]:
+            attributes["time to"] = _time_to_str(value)
+        if value := cols["arrival_status"][0]:
+            attributes["status"] = value
+        return _add_next(attributes, cols["arrival_time"])
 
 class MBTAArrivalDelaySensor(MBTABaseTripSensor):
     """Sensor for arrival delay."""
 
+    __slots__ = ()
+
     _attr_entity_registry_enabled_default = False  # This keeps the sensor disabled by default
+    _attr_device_class = SensorDeviceClass.DURATION
+    _attr_native_unit_of_measurement = UnitOfTime.MINUTES
+    _FIELD = "arrival_deltatime"
+    _NEXT_FMT = staticmethod(_minutes)
 
-    @property
-    def state(self):
+    @staticmethod
+    def _native_value(data: TripsSnapshot):
         """Return the state of the sensor."""
-        if self._coordinator.data:
-            trip: Trip = self._coordinator.data[0]
-            if trip.arrival_deltatime:
-                return round(trip.arrival_deltatime.total_seconds() / 60,0)
-            else:
-                return 0  # Default value when there's no delay
-        return None
+        if value := data.cols["arrival_deltatime"][0]:
+            return _minutes(value)
+        return 0  # Default value when there's no delay
 
-    @property
-    def device_class(self):
-        """Return the device class for the sensor."""
-        return SensorDeviceClass.DURATION
-
-    @property
-    def unit_of_measurement(self):
-        """Return the unit of measurement for the sensor."""
-        return UnitOfTime.MINUTES
-
-    @property
-    def extra_state_attributes(self):
-        """Return extra attributes."""
-        if self._coordinator.data and len(self._coordinator.data) > 0:
-            attributes = {}
-            next = []
-            for item in self._coordinator.data[1:]:
-                if item.arrival_deltatime:
-                    next.append(round(item.arrival_deltatime.total_seconds() / 60,0))
-            if len(next) >0:
-                attributes["next"] = next
-            return attributes  # Return the dictionary of attributes
-        
 class MBTAArrivalTimeToSensor(MBTABaseTripSensor):
     """Sensor for arrival time to."""        
 
+    __slots__ = ()
+
     _attr_entity_registry_enabled_default = False  # This keeps the sensor disabled by default
+    _attr_device_class = SensorDeviceClass.DURATION
+    _attr_native_unit_of_measurement = UnitOfTime.MINUTES
+    _FIELD = "arrival_time_to"
+    _NEXT_FMT = staticmethod(_time_to_minutes)
 
-    @property
-    def state(self):
+    @staticmethod
+    def _native_value(data: TripsSnapshot):
         """Return the state of the sensor."""
-        if self._coordinator.data:
-            trip: Trip = self._coordinator.data[0]
-            if trip.arrival_time_to:
-                time_to = round(trip.arrival_time_to.total_seconds() / 60,0)
-                if time_to >= 0:
-                    return time_to
-                elif time_to < 0:
-                    return 0
+        if value := data.cols["arrival_time_to"][0]:
+            return _time_to_minutes(value)
         return None
 
-    @property
-    def device_class(self):
-        """Return the device class for the sensor."""
-        return SensorDeviceClass.DURATION
-
-    @property
-    def unit_of_measurement(self):
-        """Return the unit of measurement for the sensor."""
-        return UnitOfTime.MINUTES
-
-    @property
-    def extra_state_attributes(self):
-        """Return extra attributes."""
-        if self._coordinator.data and len(self._coordinator.data) > 0:
-            attributes = {}
-            next = []
-            for item in self._coordinator.data[1:]:
-                if item.arrival_time_to:
-                    next.append(round(item.arrival_time_to.total_seconds() / 60,0))
-            if len(next) >0:
-                attributes["next"] = next
-            return attributes  # Return the dictionary of attributes
-        
 class MBTAArrivalStatusSensor(MBTABaseTripSensor):
     """Sensor for arrival status."""
 
-    _attr_entity_registry_enabled_default = False  # This keeps the sensor disabled by default
+    __slots__ = ()
 
-    @property
-    def state(self):
-        """Return the state of the sensor."""
-        if self._coordinator.data:
-            trip: Trip = self._coordinator.data[0]
-            if trip.arrival_status:
-                return trip.arrival_status
-        return "unavailable"
+    _attr_entity_registry_enabled_default = False  # This keeps the sensor disabled by default
+    _FIELD = "arrival_status"
     
-    @property
-    def extra_state_attributes(self):
-        """Return extra attributes."""
-        if self._coordinator.data and len(self._coordinator.data) > 0:
-            attributes = {}
-            next = []
-            for item in self._coordinator.data[1:]:
-                if item.arrival_status:
-                    next.append(item.arrival_status)
-            if len(next) >0:
-                attributes["next"] = next
-            return attributes  # Return the dictionary of attributes
-
 class MBTAArrivalCountdownSensor(MBTABaseTripSensor):
     """Sensor for arrival status."""
 
-    _attr_entity_registry_enabled_default = False  # This keeps the sensor disabled by default
+    __slots__ = ()
 
-    @property
-    def state(self):
-        """Return the state of the sensor."""
-        if self._coordinator.data:
-            trip: Trip = self._coordinator.data[0]
-            if trip.arrival_countdown:
-                return trip.arrival_countdown
-        return "unavailable"
+    _attr_entity_registry_enabled_default = False  # This keeps the sensor disabled by default
+    _FIELD = "arrival_countdown"
     
-    @property
-    def extra_state_attributes(self):
-        """Return extra attributes."""
-        if self._coordinator.data and len(self._coordinator.data) > 0:
-            attributes = {}
-            next = []
-            for item in self._coordinator.data[1:]:
-                if item.arrival_countdown:
-                    next.append(item.arrival_countdown)
-            if len(next) >0:
-                attributes["next"] = next
-            return attributes  # Return the dictionary of attributes
-        
 #ALERTS
 class MBTAAlertsSensor(MBTABaseTripSensor):
     """Sensor for trip alerts."""
 
-    @property
-    def state(self):
+    __slots__ = ()
+
+    _attr_native_unit_of_measurement = "alerts"
+
+    @staticmethod
+    def _native_value(data: TripsSnapshot):
         """Return the state of the sensor."""
-        if self._coordinator.data:
-            trip: Trip = self._coordinator.data[0]
-            if trip.mbta_alerts:
-                return len(trip.mbta_alerts)
+        if value := data.cols["mbta_alerts"][0]:
+            return len(value)
         return 0
 
-    @property
-    def unit_of_measurement(self):
-        """Return the unit of measurement for the sensor."""
-        return "alerts"  # Count of alerts
-
-    @property
-    def extra_state_attributes(self):
-        """Return extra attributes."""
-        if self._coordinator.data:
-            trip: Trip = self._coordinator.data[0]
-            attributes = {}
-            # Add alerts
-            if trip.mbta_alerts:
-                alerts = ", ".join(mbta_alert.short_header for mbta_alert in trip.mbta_alerts)
-                attributes["alerts"] = alerts
-            return attributes  # Return the dictionary of attributes
-        return None
+    @staticmethod
+    def _build_attributes(cols: Mapping[str, list]) -> dict:
+        """Build extra attributes from the latest trips columns."""
+        attributes = {}
+        # Add alerts
+        if mbta_alerts := cols["mbta_alerts"][0]:
+            alerts = ", ".join([mbta_alert.short_header for mbta_alert in mbta_alerts])
+            attributes["alerts"] = alerts
+        return attributes
+
+# Icons indexed by MBTA route type (light rail, subway, rail, bus, ferry)
+_ROUTE_ICONS: Final = (
+    "mdi:subway-variant",
+    "mdi:subway-variant",
+    "mdi:train",
+    "mdi:bus",
+    "mdi:ferry",
+)
+
+# Placeholder for the icon of the route type, resolved at setup
+_ROUTE_ICON = object()
+
+# (sensor class, sensor name, icon) of the sensors created for every trip
+_SENSOR_SPECS: tuple[tuple[type[MBTABaseTripSensor], str, object], ...] = (
+    (MBTAHeadsignSensor, "Headsign", "mdi:sign-direction"),
+    (MBTADestinationSensor, "Destination", "mdi:sign-direction"),
+    (MBTADirectionSensor, "Direction", "mdi:sign-direction"),
+    (MBTADurationSensor, "Duration", "mdi:timelapse"),
+    (MBTARouteNameSensor, "Line", _ROUTE_ICON),
+    (MBTARouteTypeSensor, "Type", _ROUTE_ICON),
+    (MBTARouteColorSensor, "Color", _ROUTE_ICON),
+    (MBTAVehicleStatusSensor, "Vehicle Status", "mdi:wifi"),
+    (MBTAVehicleSpeedSensor, "Vehicle Speed", "mdi:speedometer"),
+    (MBTAVehicleLonSensor, "Vehicle Longitude", "mdi:map-marker"),
+    (MBTAVehicleLatSensor, "Vehicle Latitude", "mdi:map-marker"),
+    (MBTAVehicleLastUpdateSensor, "Vehicle Last Update", "mdi:update"),
+    (MBTADepartureNameSensor, "From", "mdi:bus-stop-uncovered"),
+    (MBTADepartureTimeSensor, "Departure Time", "mdi:clock-start"),
+    (MBTADepartureDelaySensor, "Departure Delay", "mdi:clock-alert-outline"),
+    (MBTADepartureTimeToSensor, "Time To Departure", "mdi:progress-clock"),
+    (MBTADepartureStatusSensor, "Departure Status", "mdi:wifi"),
+    (MBTADepartureCountdownSensor, "Departure MBTA Countdown", "mdi:av-timer"),
+    (MBTAArrivalNameSensor, "To", "mdi:bus-stop-uncovered"),
+    (MBTAArrivalTimeSensor, "Arrival Time", "mdi:clock-end"),
+    (MBTAArrivalDelaySensor, "Arrival Delay", "mdi:clock-alert-outline"),
+    (MBTAArrivalTimeToSensor, "Time To Arrival", "mdi:progress-clock"),
+    (MBTAArrivalStatusSensor, "Arrival Status", "mdi:wifi"),
+    (MBTAArrivalCountdownSensor, "Arrival MBTA Countdown", "mdi:av-timer"),
+    (MBTAAlertsSensor, "Alerts", "mdi:alert-outline"),
+)
+
+# Sensor specs of each route type, built on first use
+_SENSOR_SPECS_BY_ROUTE_TYPE: dict[int, tuple[tuple[type[MBTABaseTripSensor], str, object], ...]] = {}
+
+def _build_specs(route_type: int) -> tuple[tuple[type[MBTABaseTripSensor], str, object], ...]:
+    """Return the sensor specs of a route type, adding the route specific sensors."""
+    specs = list(_SENSOR_SPECS)
+    if route_type == 2:
+        specs.append((MBTANameSensor, "Train", _ROUTE_ICON))
+    if route_type != 3:
+        specs.append((MBTADeparturePlatformSensor, "Departure Platform", "mdi:bus-stop-uncovered"))
+        specs.append((MBTAArrivalPlatformSensor, "Arrival Platform", "mdi:bus-stop-uncovered"))
+    specs = _SENSOR_SPECS_BY_ROUTE_TYPE[route_type] = tuple(specs)
+    return specs
 
 async def async_setup_entry(
     hass: HomeAssistant,
     entry: ConfigEntry,
     async_add_entities: AddEntitiesCallback,
-) -> bool:
+) -> None:
     """Set up the sensor platform."""
     _LOGGER.debug("Setting up MBTA Trip sensors")
 
-    # Extract configuration data
-    depart_from = entry.data.get("depart_from")
-    arrive_at = entry.data.get("arrive_at")
-    api_key = entry.data.get("api_key")
     name = entry.title
     config_entry_id = entry.entry_id
-
-    try:
-        _LOGGER.debug(f"Initializing MBTAClient with API key {api_key}")
-
-        mbta_client = MBTAClient(api_key=api_key,cache_manager=MBTACacheManager())
-        
-        _LOGGER.debug(f"Creating TripsHandler for departure from {depart_from} to {arrive_at}")
-
-        trips_handler = await TripsHandler.create(departure_stop_name=depart_from, mbta_client=mbta_client,arrival_stop_name=arrive_at, sort_by=StopType.ARRIVAL, max_trips=2)
-
-        # Create and refresh the coordinator
-        coordinator = MBTATripCoordinator(hass, trips_handler)
-
-        _LOGGER.debug("Refreshing coordinator")
-
-        await coordinator.async_config_entry_first_refresh()
-
-        # Get the first trip and determine the route icon
-        trip: Trip = coordinator.data[0]
-        route_type = trip.route_type
-        icon = {
-            0: "mdi:subway-variant",
-            1: "mdi:subway-variant",
-            2: "mdi:train",
-            3: "mdi:bus",
-            4: "mdi:ferry",
-        }.get(route_type, "mdi:train")
-
-        # Create sensors
-        _LOGGER.debug("Creating sensors for trip data")
-        sensors = [
-            MBTAHeadsignSensor(config_entry_name=name,config_entry_id=config_entry_id,coordinator=coordinator,sensor_name="Headsign",icon="mdi:sign-direction"),
-            MBTADestinationSensor(config_entry_name=name,config_entry_id=config_entry_id,coordinator=coordinator,sensor_name="Destination",icon="mdi:sign-direction"),
-            MBTADirectionSensor(config_entry_name=name,config_entry_id=config_entry_id,coordinator=coordinator,sensor_name="Direction",icon="mdi:sign-direction"),
-            MBTADurationSensor(config_entry_name=name,config_entry_id=config_entry_id,coordinator=coordinator,sensor_name="Duration",icon="mdi:timelapse"),
-            MBTARouteNameSensor(config_entry_name=name,config_entry_id=config_entry_id,coordinator=coordinator,sensor_name="Line",icon=icon),
-            MBTARouteTypeSensor(config_entry_name=name,config_entry_id=config_entry_id,coordinator=coordinator,sensor_name="Type",icon=icon),
-            MBTARouteColorSensor(config_entry_name=name,config_entry_id=config_entry_id,coordinator=coordinator,sensor_name="Color",icon=icon),
-            MBTAVehicleStatusSensor(config_entry_name=name,config_entry_id=config_entry_id,coordinator=coordinator,sensor_name="Vehicle Status",icon="mdi:wifi"),
-            MBTAVehicleSpeedSensor(config_entry_name=name,config_entry_id=config_entry_id,coordinator=coordinator,sensor_name="Vehicle Speed",icon="mdi:speedometer"),
-            MBTAVehicleLonSensor(config_entry_name=name,config_entry_id=config_entry_id,coordinator=coordinator,sensor_name="Vehicle Longitude",icon="mdi:map-marker"),
-            MBTAVehicleLatSensor(config_entry_name=name,config_entry_id=config_entry_id,coordinator=coordinator,sensor_name="Vehicle Latitude",icon="mdi:map-marker"),
-            MBTAVehicleLastUpdateSensor(config_entry_name=name,config_entry_id=config_entry_id,coordinator=coordinator,sensor_name="Vehicle Last Update",icon="mdi:update"),
-            MBTADepartureNameSensor(config_entry_name=name,config_entry_id=config_entry_id,coordinator=coordinator,sensor_name="From",icon="mdi:bus-stop-uncovered",),
-            MBTADepartureTimeSensor(config_entry_name=name,config_entry_id=config_entry_id,coordinator=coordinator,sensor_name="Departure Time",icon="mdi:clock-start"),
-            MBTADepartureDelaySensor(config_entry_name=name,config_entry_id=config_entry_id,coordinator=coordinator,sensor_name="Departure Delay",icon="mdi:clock-alert-outline"),
-            MBTADepartureTimeToSensor(config_entry_name=name,config_entry_id=config_entry_id,coordinator=coordinator,sensor_name="Time To Departure",icon="mdi:progress-clock"),
-            MBTADepartureStatusSensor(config_entry_name=name,config_entry_id=config_entry_id,coordinator=coordinator,sensor_name="Departure Status",icon="mdi:wifi"),
-            MBTADepartureCountdownSensor(config_entry_name=name,config_entry_id=config_entry_id,coordinator=coordinator,sensor_name="Departure MBTA Countdown",icon="mdi:av-timer"),
-            MBTAArrivalNameSensor(config_entry_name=name,config_entry_id=config_entry_id,coordinator=coordinator,sensor_name="To",icon="mdi:bus-stop-uncovered"),
-            MBTAArrivalTimeSensor(config_entry_name=name,config_entry_id=config_entry_id,coordinator=coordinator,sensor_name="Arrival Time",icon="mdi:clock-end"),
-            MBTAArrivalDelaySensor(config_entry_name=name,config_entry_id=config_entry_id,coordinator=coordinator,sensor_name="Arrival Delay",icon="mdi:clock-alert-outline"),
-            MBTAArrivalTimeToSensor(config_entry_name=name,config_entry_id=config_entry_id,coordinator=coordinator,sensor_name="Time To Arrival",icon="mdi:progress-clock"),
-            MBTAArrivalStatusSensor(config_entry_name=name,config_entry_id=config_entry_id,coordinator=coordinator,sensor_name="Arrival Status",icon="mdi:wifi"),
-            MBTAArrivalCountdownSensor(config_entry_name=name,config_entry_id=config_entry_id,coordinator=coordinator,sensor_name="Arrival MBTA Countdown",icon="mdi:av-timer"),
-            MBTAAlertsSensor(config_entry_name=name,config_entry_id=config_entry_id,coordinator=coordinator,sensor_name="Alerts",icon="mdi:alert-outline"),
-        ]
-
-        if route_type == 2:
-            mbta_name_sensor = MBTANameSensor(config_entry_name=name,config_entry_id=config_entry_id,coordinator=coordinator,sensor_name="Train",icon=icon)
-            sensors.append(mbta_name_sensor)
-        if route_type != 3:
-            mbta_departure_platform_sensor = MBTADeparturePlatformSensor(config_entry_name=name,config_entry_id=config_entry_id,coordinator=coordinator,sensor_name="Departure Platform",icon="mdi:bus-stop-uncovered")
-            sensors.append(mbta_departure_platform_sensor)
-            mbta_arrival_platform_sensor = MBTAArrivalPlatformSensor(config_entry_name=name,config_entry_id=config_entry_id,coordinator=coordinator,sensor_name="Arrival Platform",icon="mdi:bus-stop-uncovered")
-            sensors.append(mbta_arrival_platform_sensor)
-
-        # Add the sensors to Home Assistant
-        async_add_entities(sensors)
-        _LOGGER.debug("Setting up MBTA Trip sensors completed successfully.")
-        return True
-
-    except Exception as e:
-        _LOGGER.error(f"Error setting up MBTA Trip sensors: {e}")
-        return False
+    coordinator: MBTATripCoordinator = hass.data[DOMAIN][config_entry_id]
+
+    # Determine the route icon from the first trip
+    route_type = coordinator.data.cols["route_type"][0]
+    if isinstance(route_type, int) and 0 <= route_type < len(_ROUTE_ICONS):
+        icon = _ROUTE_ICONS[route_type]
+    else:
+        icon = "mdi:train"
+
+    # Create sensors
+    _LOGGER.debug("Creating sensors for trip data")
+    # Entity id format and device info shared by the sensors of the entry
+    base = {
+        "config_entry_id": config_entry_id,
+        "coordinator": coordinator,
+        "entity_id_format": f"sensor.{slugify(name)}_{{}}",
+        "device_info": {
+            "identifiers": {(config_entry_id,)},
+            "name": name,
+            "model": "MBTA Live Trip Info",
+        },
+    }
+    specs = _SENSOR_SPECS_BY_ROUTE_TYPE.get(route_type) or _build_specs(route_type)
+    sensors = [
+        cls(**base, sensor_name=sensor_name, icon=(icon if sensor_icon is _ROUTE_ICON else sensor_icon))
+        for cls, sensor_name, sensor_icon in specs
+    ]
+
+    # Add the sensors to Home Assistant, the coordinator is already refreshed
+    async_add_entities(sensors, update_before_add=False)
+    _LOGGER.debug("Setting up MBTA Trip sensors completed successfully.")